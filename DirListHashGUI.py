@@ -1,9 +1,21 @@
 import hashlib
+import mmap
 import os
 import csv
+import collections
+import concurrent.futures
 import datetime
+import functools
+import io
+import itertools
+import multiprocessing
+import operator
+import pathlib
+import queue
+import re
 import sqlite3
 import sys
+import time
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 import threading
@@ -11,244 +23,630 @@ import subprocess
 import platform
 from PIL import Image
 
+try:
+    import polars as pl # Optional: only needed for Parquet output
+except ImportError:
+    pl = None
+
+try:
+    import blake3 # Optional: only needed for the BLAKE3 hash choice
+except ImportError:
+    blake3 = None
+
 # --- Core Logic Functions (Optimized) ---
 
 app_name = "DirListHash"
 app_version = "v1.1 GUI"
 
-def hash_file(filepath, hash_type='sha1'):
-    """Calculates the hash of a given file based on hash_type."""
-    if hash_type.lower() == 'md5':
-        hasher = hashlib.md5()
-    elif hash_type.lower() == 'sha1':
-        hasher = hashlib.sha1()
-    else:
+HASH_CHUNK_SIZE = 1 << 20 # 1 MiB reads, reused per worker thread
+MMAP_THRESHOLD = 64 << 20 # Files above this are handed to the hasher as one mapping
+PARALLEL_HASH_THRESHOLD = 256 << 20 # Above this, SHA1 and MD5 of one file run on separate threads
+PROGRESS_INTERVAL = 100 # Items between progress checks while collecting
+PROGRESS_MIN_SECONDS = 0.2 # Minimum time between progress updates (rate limit)
+PROGRESS_POLL_MS = 100 # How often the GUI shows the latest progress update
+# Hashing threads mostly wait on read(), so run more of them than cores to keep
+# several reads in flight per core (same sizing as the stdlib's I/O-bound default)
+HASH_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+SQLITE_BATCH_SIZE = 50000 # Rows per executemany call during SQLite export
+WALK_QUEUE_SIZE = 1024 # Items the directory walker may run ahead of the report writer
+PROCESS_BATCH_SIZE = 64 # Files per task when hashing in worker processes
+HASH_PROCESSES = min(61, os.cpu_count() or 1) # Windows caps process pools at 61 workers
+CSV_BUFFER_SIZE = 1 << 20 # Write buffer for the CSV report
+CSV_BATCH_SIZE = 10000 # Rows formatted per write during CSV export
+CSV_SPECIAL_CHARS = re.compile('[",\r\n]') # Characters that make csv quote a field
+TIMESTAMP_CACHE_SIZE = 8192 # Formatted whole-second timestamps kept by _fmt_ts
+DROP_CACHE_THRESHOLD = 64 << 20 # Files above this are dropped from the page cache once hashed
+HAS_FADVISE = hasattr(os, 'posix_fadvise') # Readahead/cache hints are POSIX-only
+
+# One report row. A namedtuple costs no more memory than a plain tuple, and the
+# exporters below still pick columns out of it by position
+Item = collections.namedtuple('Item', ['type', 'full_path', 'name', 'size', 'sha1', 'md5',
+                                       'ctime', 'mtime', 'atime', 'device', 'inode', 'mtime_ns', 'blake3'])
+# Report column for each Item position
+CSV_COLUMNS = ('Type', 'Full Path', 'Name', 'Size (bytes)', 'SHA1 Hash', 'MD5 Hash',
+               'Creation Time', 'Modification Time', 'Access Time',
+               'Device', 'Inode', 'Modification Time (ns)', 'BLAKE3 Hash')
+# Raw identity columns let a later run reuse hashes of unchanged files (see load_hash_cache)
+SQLITE_COLUMNS = ('Type TEXT', 'FullPath TEXT NOT NULL', 'Name TEXT', 'Size INTEGER',
+                  'SHA1Hash TEXT', 'MD5Hash TEXT', 'CreationTime TEXT', 'ModificationTime TEXT',
+                  'AccessTime TEXT', 'Device INTEGER', 'Inode INTEGER', 'ModificationTimeNs INTEGER',
+                  'BLAKE3Hash TEXT')
+_HASH_FIELDS = {'sha1': (4,), 'md5': (5,), 'both': (4, 5), 'none': (), 'blake3': (12,)}
+# Item positions kept by each export, per hash choice
+CSV_FIELDS = {choice: (0, 1, 2, 3, *fields, 6, 7, 8) for choice, fields in _HASH_FIELDS.items()}
+SQLITE_FIELDS = {choice: (*fields, 9, 10, 11) for choice, fields in CSV_FIELDS.items()}
+
+# Hasher constructors per hash choice as (SHA1, MD5, BLAKE3); resolved once per scan, not per file
+HASH_FACTORIES = {
+    'sha1': (hashlib.sha1, None, None),
+    'md5': (None, hashlib.md5, None),
+    'both': (hashlib.sha1, hashlib.md5, None),
+    'none': (None, None, None),
+}
+if blake3 is not None:
+    # AUTO lets BLAKE3 split one large update across cores (see hash_file_blake3)
+    HASH_FACTORIES['blake3'] = (None, None, functools.partial(blake3.blake3, max_threads=blake3.blake3.AUTO))
+
+_read_buffers = threading.local()
+
+def _get_read_buffer():
+    """Returns the calling thread's reusable read buffer as a memoryview."""
+    view = getattr(_read_buffers, 'view', None)
+    if view is None:
+        view = _read_buffers.view = memoryview(bytearray(HASH_CHUNK_SIZE))
+    return view
+
+def _advise_sequential(f, size):
+    """Asks the kernel for aggressive readahead on a file about to be streamed (no-op without posix_fadvise, e.g. Windows)."""
+    if HAS_FADVISE and size is not None and size > HASH_CHUNK_SIZE:
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+def _drop_cached(f, size):
+    """Evicts a hashed huge file from the page cache so it does not push out data other files still need."""
+    if HAS_FADVISE and size is not None and size > DROP_CACHE_THRESHOLD:
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+def _feed_hashers(f, hashers, size=None):
+    """Streams an open binary file through every hasher in a single pass; size skips the fstat when known."""
+    if size is None:
+        size = os.fstat(f.fileno()).st_size
+    if size > MMAP_THRESHOLD:
+        # One update per hasher lets OpenSSL consume the whole file without the GIL
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL) # Read ahead further on the page faults
+            if len(hashers) > 1 and len(mm) > PARALLEL_HASH_THRESHOLD:
+                # Each update() runs without the GIL, so the extra digests hash the
+                # same mapping on their own threads instead of waiting their turn
+                helpers = [threading.Thread(target=hasher.update, args=(mm,)) for hasher in hashers[1:]]
+                for helper in helpers:
+                    helper.start()
+                hashers[0].update(mm)
+                for helper in helpers:
+                    helper.join()
+            else:
+                for hasher in hashers:
+                    hasher.update(mm)
+        return
+    view = _get_read_buffer()
+    while True:
+        n = f.readinto(view)
+        if not n:
+            break
+        chunk = view[:n]
+        for hasher in hashers:
+            hasher.update(chunk)
+
+def hash_file(filepath, hasher_factory=hashlib.sha1, size=None):
+    """
+    Calculates the hash of a given file with a hasher built by hasher_factory (e.g. hashlib.md5).
+    size is an optional hint from a prior stat.
+    """
+    if hasher_factory is None:
         return ''
+    hasher = hasher_factory()
 
     try:
-        with open(filepath, "rb") as f:
-            while True:
-                chunk = f.read(4096)
-                if not chunk:
-                    break
-                hasher.update(chunk)
+        with open(filepath, "rb", buffering=0) as f:
+            _advise_sequential(f, size)
+            # Small files (the bulk of most trees) take one read into the reusable
+            # buffer; file_digest would allocate a fresh 256 KiB buffer per call
+            if hasattr(hashlib, 'file_digest') and (size is None or size > HASH_CHUNK_SIZE):
+                # Python 3.11+: the read/update loop runs in C against OpenSSL
+                hashlib.file_digest(f, lambda: hasher) # Feeds hasher in place
+            else:
+                _feed_hashers(f, (hasher,), size)
+            _drop_cached(f, size)
         return hasher.hexdigest()
     except Exception as e:
         sys.stdout.write(f"\nError hashing file {filepath}: {e}\n")
         sys.stdout.flush()
         return ''
 
-def get_file_details(filepath):
-    """Retrieves file details including size and timestamps."""
+def hash_file_blake3(filepath, blake3_factory, size=None):
+    """
+    Calculates the BLAKE3 hash of a given file. Files above MMAP_THRESHOLD are hashed with
+    update_mmap, a single update over the whole file that a multithreaded hasher spreads
+    across cores; smaller files go through hash_file. size is an optional stat hint.
+    """
+    if size is None or size <= MMAP_THRESHOLD:
+        return hash_file(filepath, blake3_factory, size)
+    hasher = blake3_factory()
     try:
-        stat_info = os.stat(filepath)
+        hasher.update_mmap(filepath)
+        return hasher.hexdigest()
+    except Exception as e:
+        sys.stdout.write(f"\nError hashing file {filepath}: {e}\n")
+        sys.stdout.flush()
+        return ''
+
+def hash_file_multi(filepath, sha1_factory=hashlib.sha1, md5_factory=hashlib.md5, size=None):
+    """
+    Calculates the SHA1 and/or MD5 hash of a given file in a single read pass; pass None
+    for a factory to skip that digest (see HASH_FACTORIES). size is an optional stat hint.
+    """
+    if sha1_factory is None or md5_factory is None:
+        # At most one digest requested, so hash_file can hand the whole loop to OpenSSL
+        file_hash = hash_file(filepath, sha1_factory or md5_factory, size)
+        return (file_hash, '') if sha1_factory else ('', file_hash)
+
+    sha1_hasher = sha1_factory()
+    md5_hasher = md5_factory()
+    try:
+        with open(filepath, "rb", buffering=0) as f:
+            _advise_sequential(f, size)
+            _feed_hashers(f, (sha1_hasher, md5_hasher), size)
+            _drop_cached(f, size)
+        return sha1_hasher.hexdigest(), md5_hasher.hexdigest()
+    except Exception as e:
+        sys.stdout.write(f"\nError hashing file {filepath}: {e}\n")
+        sys.stdout.flush()
+        return '', ''
+
+@functools.lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _fmt_ts(ts):
+    """
+    Formats a whole-second POSIX timestamp as local 'YYYY-MM-DD HH:MM:SS' without building a
+    datetime. Memoized: files written together share seconds, so repeats are a dict lookup.
+    """
+    tm = time.localtime(ts)
+    return f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d} {tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}"
+
+def _fmt_times(stat_info):
+    """
+    Formats the creation, modification and access times of a stat result in one call.
+    Times that fall in the same whole second (ctime == mtime is common) are formatted once.
+    """
+    ctime_s = stat_info.st_ctime_ns // 1_000_000_000
+    mtime_s = stat_info.st_mtime_ns // 1_000_000_000
+    atime_s = stat_info.st_atime_ns // 1_000_000_000
+    ctime = _fmt_ts(ctime_s)
+    mtime = ctime if mtime_s == ctime_s else _fmt_ts(mtime_s)
+    if atime_s == mtime_s:
+        atime = mtime
+    elif atime_s == ctime_s:
+        atime = ctime
+    else:
+        atime = _fmt_ts(atime_s)
+    return ctime, mtime, atime
+
+def _file_identity(stat_info):
+    """Returns (device, inode, mtime_ns) for the hash cache; zero ids (Windows scandir) become None."""
+    return stat_info.st_dev or None, stat_info.st_ino or None, stat_info.st_mtime_ns
+
+def get_file_details(entry):
+    """Retrieves file or folder details including size, timestamps and hash-cache identity from an os.DirEntry."""
+    try:
+        stat_info = entry.stat() # Cached by scandir, no second path lookup
         size = stat_info.st_size
-        creation_time = datetime.datetime.fromtimestamp(stat_info.st_ctime).strftime("%Y-%m-%d %H:%M:%S")
-        modification_time = datetime.datetime.fromtimestamp(stat_info.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-        access_time = datetime.datetime.fromtimestamp(stat_info.st_atime).strftime("%Y-%m-%d %H:%M:%S")
-        return size, creation_time, modification_time, access_time
+        creation_time, modification_time, access_time = _fmt_times(stat_info)
+        return (size, creation_time, modification_time, access_time) + _file_identity(stat_info)
     except Exception as e:
-        sys.stdout.write(f"\nError getting details for {filepath}: {e}\n")
+        sys.stdout.write(f"\nError getting details for {entry.path}: {e}\n")
         sys.stdout.flush()
-        return 0, '', '', ''
+        return 0, '', '', '', None, None, None
 
-def collect_directory_data(directory_path, hash_choice, update_counter):
+def load_hash_cache(previous_db_file):
     """
-    Collects file and directory details including hashes into a list of dictionaries.
-    Optimized: Progress reporting is throttled to minimize GUI overhead.
+    Loads file hashes from a previous SQLite report, keyed on
+    (FullPath, Device, Inode, Size, ModificationTimeNs), so unchanged files can skip hashing.
+    Returns an empty dict if the report predates these columns or cannot be read.
     """
-    all_items_data = []
+    try:
+        # Read-only URI so a mistyped path is never created as an empty database
+        conn = sqlite3.connect(pathlib.Path(previous_db_file).resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            available = {row[1] for row in conn.execute("PRAGMA table_info(directory_contents)")}
+            if not {'Device', 'Inode', 'ModificationTimeNs'} <= available:
+                sys.stdout.write(f"\nNo reusable hashes in {previous_db_file}: report predates the hash cache columns.\n")
+                sys.stdout.flush()
+                return {}
+            sha1_column = 'SHA1Hash' if 'SHA1Hash' in available else "''"
+            md5_column = 'MD5Hash' if 'MD5Hash' in available else "''"
+            blake3_column = 'BLAKE3Hash' if 'BLAKE3Hash' in available else "''"
+            rows = conn.execute(f"SELECT FullPath, Device, Inode, Size, ModificationTimeNs, {sha1_column}, {md5_column}, "
+                                f"{blake3_column} FROM directory_contents WHERE Type = 'File'")
+            return {row[:5]: (row[5] or '', row[6] or '', row[7] or '') for row in rows}
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        sys.stdout.write(f"\nError reading hash cache {previous_db_file}: {e}\n")
+        sys.stdout.flush()
+        return {}
+
+def _scan_tree(directory_path):
+    """
+    Walks the tree top-down in the same order as os.walk, but in a single pass over
+    os.scandir so the DirEntry type and stat caches can be reused by the caller.
+    Yields a (file_entries, dir_entries) pair for every directory visited.
+    """
+    pending = [directory_path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue # Unreadable directories are skipped, as os.walk does by default
+
+        file_entries = []
+        dir_entries = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                dir_entries.append(entry)
+            else:
+                file_entries.append(entry)
+        yield file_entries, dir_entries
+
+        # Descend in listing order; symlinked folders are listed but not followed
+        pending.extend(reversed([entry.path for entry in dir_entries if not entry.is_symlink()]))
+
+def _build_row(item_type, full_path, entry, details, sha1_hash='', md5_hash='', blake3_hash=''):
+    """Assembles one Item in report column order from get_file_details() output."""
+    size, ctime, mtime, atime, device, inode, mtime_ns = details
+    return Item(item_type, full_path, entry.name, size, sha1_hash, md5_hash, ctime, mtime, atime,
+                device, inode, mtime_ns, blake3_hash)
+
+def _count_file_sizes(directory_path):
+    """Counts how many files share each size, so files with a unique size can skip hashing."""
+    size_counts = collections.Counter()
+    for file_entries, _ in _scan_tree(directory_path):
+        for entry in file_entries:
+            try:
+                size_counts[entry.stat().st_size] += 1
+            except OSError:
+                pass
+    return size_counts
+
+def _count_items(directory_path):
+    """Counts the files and folders a scan will report (names only, no stat), for a progress total."""
     total_items = 0
-    # First pass to get total count
-    for _, dirs, files in os.walk(directory_path):
-        total_items += len(files)
-        total_items += len(dirs)
+    for file_entries, dir_entries in _scan_tree(directory_path):
+        total_items += len(file_entries) + len(dir_entries)
+    return total_items
+
+def _hash_one(entry, sha1_factory, md5_factory, blake3_factory=None, hash_cache=None, size_counts=None):
+    """
+    Stats and hashes a single file from an os.DirEntry and returns its Item; runs
+    inside a worker thread. Hashes found in hash_cache for an unchanged file (same path,
+    device, inode, size and mtime) are reused instead of re-reading the file. When
+    size_counts is given, files whose size no other file shares are left unhashed.
+    The factories come from HASH_FACTORIES; None skips that digest.
+    """
+    filepath = entry.path
+    details = get_file_details(entry)
+    want_sha1 = sha1_factory is not None
+    want_md5 = md5_factory is not None
+    want_blake3 = blake3_factory is not None
+
+    if size_counts is not None and size_counts[details[0]] < 2:
+        return _build_row('File', filepath, entry, details)
+
+    if hash_cache and details[6] is not None:
+        size, _, _, _, device, inode, mtime_ns = details
+        cached = hash_cache.get((filepath, device, inode, size, mtime_ns))
+        if cached and (cached[0] or not want_sha1) and (cached[1] or not want_md5) and (cached[2] or not want_blake3):
+            return _build_row('File', filepath, entry, details, cached[0] if want_sha1 else '',
+                              cached[1] if want_md5 else '', cached[2] if want_blake3 else '')
+
+    size_hint = details[0] if details[6] is not None else None # Skips a second stat when hashing
+    if want_blake3:
+        # BLAKE3 is offered on its own, never together with SHA1/MD5
+        return _build_row('File', filepath, entry, details, blake3_hash=hash_file_blake3(filepath, blake3_factory, size_hint))
+    file_sha1_hash, file_md5_hash = hash_file_multi(filepath, sha1_factory, md5_factory, size=size_hint)
+    return _build_row('File', filepath, entry, details, file_sha1_hash, file_md5_hash)
+
+class _PathEntry(collections.namedtuple('_PathEntry', ['path', 'name', 'stat_result'])):
+    """
+    Picklable stand-in for os.DirEntry, so files can be handed to worker processes. Carries the
+    walker's DirEntry.stat() result, so both modes see the same (Windows: zero) device/inode ids.
+    """
+    __slots__ = ()
+
+    def stat(self):
+        if self.stat_result is None:
+            return os.stat(self.path) # The walker's stat failed: raise the same error here
+        return self.stat_result
+
+def _path_entry(entry):
+    """Builds a _PathEntry from an os.DirEntry, reusing its (cached) stat result."""
+    try:
+        stat_result = entry.stat()
+    except OSError:
+        stat_result = None
+    return _PathEntry(entry.path, entry.name, stat_result)
 
+_process_hash_one = None
+
+def _init_hash_process(hash_one):
+    """Worker process initializer: receives the configured _hash_one (and its hash cache) once, not per task."""
+    global _process_hash_one
+    _process_hash_one = hash_one
+
+def _hash_batch(entries):
+    """Runs in a worker process: hashes a batch of _PathEntry files and returns their Items."""
+    return [_process_hash_one(entry) for entry in entries]
+
+def _submit_threaded(executor, hash_one, file_entries):
+    """Submits each file to the thread pool as its own task."""
+    for entry in file_entries:
+        yield executor.submit(hash_one, entry)
+
+def _submit_batched(executor, file_entries):
+    """Submits files to the process pool PROCESS_BATCH_SIZE at a time, so IPC is paid per batch, not per file."""
+    for start in range(0, len(file_entries), PROCESS_BATCH_SIZE):
+        batch = [_path_entry(entry) for entry in file_entries[start:start + PROCESS_BATCH_SIZE]]
+        yield executor.submit(_hash_batch, batch)
+
+def _walk_ahead(directory_path, submit, items, stop):
+    """
+    Producer for iter_directory_data: walks the tree on its own thread and queues every item
+    in walk order, files as the hashing futures returned by submit (see _submit_threaded and
+    _submit_batched) and folders as their DirEntry. The bounded queue keeps the walk at most
+    WALK_QUEUE_SIZE items ahead of the consumer. The last item put is None, or the exception
+    that ended the walk; setting stop abandons the walk.
+    """
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        for file_entries, dir_entries in _scan_tree(directory_path):
+            for future in submit(file_entries):
+                if not put(future):
+                    return
+            for entry in dir_entries:
+                if not put(entry):
+                    return
+        put(None)
+    except Exception as e:
+        put(e)
+
+def _iter_queued(items):
+    """Consumer side of _walk_ahead: turns the queued futures and folder entries into Items."""
+    while True:
+        item = items.get()
+        if item is None:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        if isinstance(item, concurrent.futures.Future):
+            # Futures are queued in walk order, so rows follow the directory listing
+            result = item.result()
+            if isinstance(result, list):
+                yield from result # A batch hashed in a worker process
+            else:
+                yield result
+        else:
+            # For directories, size is usually 0 or varies by OS
+            yield _build_row('Folder', item.path, item, get_file_details(item))
+
+def _iter_listing(directory_path, hash_one):
+    """
+    Listing-only scan (no digest requested): builds every Item inline, in walk order. Without
+    hashing there is no file I/O to overlap, so a pool, futures and a queue would only add overhead.
+    """
+    for file_entries, dir_entries in _scan_tree(directory_path):
+        for entry in file_entries:
+            yield hash_one(entry)
+        for entry in dir_entries:
+            # For directories, size is usually 0 or varies by OS
+            yield _build_row('Folder', entry.path, entry, get_file_details(entry))
+
+def iter_directory_data(directory_path, hash_choice, update_counter, hash_cache=None, duplicates_only=False,
+                        estimate_total=False, use_processes=False):
+    """
+    Yields file and directory details including hashes as one Item namedtuple each, in
+    (Type, FullPath, Name, Size, SHA1 Hash, MD5 Hash, Creation Time, Modification Time, Access Time,
+    Device, Inode, ModificationTimeNs, BLAKE3 Hash) order.
+    Optimized: Single scandir pass; progress is a running count, throttled to minimize GUI overhead.
+    Optimized: When hashing, the tree is walked on a producer thread while files are hashed in parallel on
+    a thread pool; listing-only scans (hash_choice 'none') build rows inline, without any pool.
+    Optimized: Unchanged files found in hash_cache (see load_hash_cache) are not re-hashed.
+    Optimized: With duplicates_only, only files that share their size with another file are hashed.
+    With estimate_total, a quick counting pass runs first so progress can show current/total.
+    With use_processes, files are hashed in batches on a process pool (for CPU-bound, cached small files).
+    """
+    # Normalize the root once: scandir builds every entry.path as root + os.sep + name,
+    # so the paths below come out normalized without a per-item normpath/join
+    directory_path = os.path.normpath(directory_path)
     current_item_count = 0
-    # Throttling interval: Update once every 1000 items, or at least once if total items < 1000.
-    progress_interval = max(1, total_items // 1000) 
+    next_progress = 0.0
+
+    total_items = None
+    if estimate_total:
+        update_counter(0, None, "Counting items...")
+        total_items = _count_items(directory_path)
+
+    size_counts = None
+    if duplicates_only and hash_choice != 'none':
+        update_counter(0, None, "Grouping files by size...")
+        # Metadata-only first pass: a file with a unique size cannot have a duplicate
+        size_counts = _count_file_sizes(directory_path)
+    sha1_factory, md5_factory, blake3_factory = HASH_FACTORIES[hash_choice]
+    hash_one = functools.partial(_hash_one, sha1_factory=sha1_factory, md5_factory=md5_factory,
+                                 blake3_factory=blake3_factory, hash_cache=hash_cache, size_counts=size_counts)
     
     # Initial update
-    update_counter(0, total_items, "Collecting data...") 
+    update_counter(0, total_items, "Collecting data...")
 
-    for root, dirs, files in os.walk(directory_path):
-        for name in sorted(files):
-            # 1. Construct and Normalize File Path
-            filepath = os.path.normpath(os.path.join(root, name))
-            
+    walker = None
+    if hash_choice == 'none':
+        # Listing only: no file reads to overlap, so skip the walker thread and the pools
+        rows = _iter_listing(directory_path, hash_one)
+    else:
+        if use_processes:
+            # Spawned, not forked: forking a process that is already running threads is unsafe,
+            # and spawn is what Windows does anyway
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=HASH_PROCESSES,
+                                                              mp_context=multiprocessing.get_context('spawn'),
+                                                              initializer=_init_hash_process, initargs=(hash_one,))
+            submit = functools.partial(_submit_batched, executor)
+        else:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=HASH_WORKERS)
+            submit = functools.partial(_submit_threaded, executor, hash_one)
+        items = queue.Queue(maxsize=WALK_QUEUE_SIZE)
+        stop = threading.Event()
+        walker = threading.Thread(target=_walk_ahead, args=(directory_path, submit, items, stop), daemon=True)
+        walker.start()
+        rows = _iter_queued(items)
+    try:
+        for row in rows:
             current_item_count += 1
-            
-            # Throttled Update
-            if current_item_count % progress_interval == 0:
-                 update_counter(current_item_count, total_items, "Collecting data...")
-
-            file_sha1_hash = ''
-            if hash_choice in ['sha1', 'both']:
-                file_sha1_hash = hash_file(filepath, 'sha1')
-            
-            file_md5_hash = ''
-            if hash_choice in ['md5', 'both']:
-                file_md5_hash = hash_file(filepath, 'md5')
 
-            size, ctime, mtime, atime = get_file_details(filepath)
-            
-            all_items_data.append({
-                'Type': 'File',
-                'FullPath': filepath, # Uses the normalized path
-                'Name': name,
-                'Size': size,
-                'SHA1 Hash': file_sha1_hash,
-                'MD5 Hash': file_md5_hash,
-                'Creation Time': ctime,
-                'Modification Time': mtime,
-                'Access Time': atime
-            })
-
-        for name in sorted(dirs):
-            # 2. Construct and Normalize Directory Path
-            dirpath = os.path.normpath(os.path.join(root, name))
-            
-            current_item_count += 1
-            
             # Throttled Update
-            if current_item_count % progress_interval == 0:
-                 update_counter(current_item_count, total_items, "Collecting data...")
-
-            stat_info = os.stat(dirpath)
-            size = stat_info.st_size
-            ctime = datetime.datetime.fromtimestamp(stat_info.st_ctime).strftime("%Y-%m-%d %H:%M:%S")
-            mtime = datetime.datetime.fromtimestamp(stat_info.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-            atime = datetime.datetime.fromtimestamp(stat_info.st_atime).strftime("%Y-%m-%d %H:%M:%S")
-            
-            all_items_data.append({
-                'Type': 'Folder',
-                'FullPath': dirpath, # Uses the normalized path
-                'Name': name,
-                'Size': size,
-                'SHA1 Hash': '',
-                'MD5 Hash': '',
-                'Creation Time': ctime,
-                'Modification Time': mtime,
-                'Access Time': atime
-            })
+            if current_item_count % PROGRESS_INTERVAL == 0 and time.monotonic() >= next_progress:
+                next_progress = time.monotonic() + PROGRESS_MIN_SECONDS
+                update_counter(current_item_count, total_items, "Collecting data...")
+
+            yield row
+    finally:
+        if walker is not None:
+            # Also runs if the consumer stops early: release the walker and drop queued hashing
+            stop.set()
+            walker.join()
+            executor.shutdown(wait=True, cancel_futures=True)
 
     # Final progress update
-    update_counter(total_items, total_items, "Collection complete.")
-    return all_items_data
+    update_counter(current_item_count, total_items, "Collection complete.")
+
+def _csv_lines(rows):
+    """Formats rows exactly as csv.writer (excel dialect, minimal quoting) writes them."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
 
 def export_to_csv(data, output_csv_file, hash_choice, update_counter):
-    """Exports the collected data to a CSV file. Optimized: Progress reporting is throttled."""
-    csv_header = ['Type', 'Full Path', 'Name', 'Size (bytes)']
-    if hash_choice in ['sha1', 'both']:
-        csv_header.append('SHA1 Hash')
-    if hash_choice in ['md5', 'both']:
-        csv_header.append('MD5 Hash')
-    csv_header.extend(['Creation Time', 'Modification Time', 'Access Time'])
-
-    total_items = len(data)
-    progress_interval = max(1, total_items // 1000)
-    
-    update_counter(0, total_items, "Exporting to CSV...")
+    """
+    Exports the collected data to a CSV file and returns the number of rows written.
+    Optimized: data may be any iterable of item tuples, so rows can stream straight from the scan.
+    """
+    fields = CSV_FIELDS[hash_choice]
+    # One itemgetter specialized to hash_choice: no per-row branching, the row loop stays in C
+    rows = map(operator.itemgetter(*fields), data)
+    # Only a path (and the name at its end) can contain a comma, quote or line break; the other
+    # columns are fixed words, numbers, hex digests and timestamps that never need quoting.
+    # Batches without such paths are formatted by str.format alone, bypassing the csv module
+    line_format = ','.join(['{}'] * len(fields)).format
+    full_path = operator.itemgetter(1)
+    total_items = 0
 
-    with open(output_csv_file, 'w', newline='', encoding='utf-8') as csvfile:
-        csv_writer = csv.writer(csvfile)
-        csv_writer.writerow(csv_header)
-        for i, item in enumerate(data):
-            # Throttled Update
-            if (i + 1) % progress_interval == 0:
-                update_counter(i + 1, total_items, "Exporting to CSV...")
-
-            row = [
-                item['Type'],
-                item['FullPath'],
-                item['Name'],
-                item['Size']
-            ]
-            if hash_choice in ['sha1', 'both']:
-                row.append(item['SHA1 Hash'])
-            if hash_choice in ['md5', 'both']:
-                row.append(item['MD5 Hash'])
-            row.extend([
-                item['Creation Time'],
-                item['Modification Time'],
-                item['Access Time']
-            ])
-            csv_writer.writerow(row)
-
-    update_counter(total_items, total_items, "CSV Export complete.")
+    with open(output_csv_file, 'wb', buffering=CSV_BUFFER_SIZE) as csvfile:
+        csvfile.write(_csv_lines([[CSV_COLUMNS[i] for i in fields]]).encode('utf-8'))
+        while True:
+            batch = list(itertools.islice(rows, CSV_BATCH_SIZE))
+            if not batch:
+                break
+            if CSV_SPECIAL_CHARS.search(''.join(map(full_path, batch))):
+                text = _csv_lines(batch)
+            else:
+                text = '\r\n'.join(itertools.starmap(line_format, batch)) + '\r\n'
+            csvfile.write(text.encode('utf-8'))
+            total_items += len(batch)
+
+    update_counter(total_items, None, "CSV Export complete.")
+    return total_items
 
 
 def export_to_sqlite(data, output_db_file, hash_choice, update_counter):
-    """Exports the collected data to an SQLite database using bulk insertion. Optimized: Progress reporting is throttled."""
+    """
+    Exports the collected data to an SQLite database using batched bulk insertion and returns the row count.
+    Optimized: Rows are built lazily and inserted SQLITE_BATCH_SIZE at a time in a single transaction.
+    """
     conn = sqlite3.connect(output_db_file)
     cursor = conn.cursor()
+    # One-shot bulk export into a fresh file: skip the fsyncs and journal overhead.
+    # Exclusive locking (set before WAL) keeps the WAL index in memory, no -shm file
+    cursor.execute("PRAGMA locking_mode=EXCLUSIVE")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
 
-    columns = [
-        "Type TEXT",
-        "FullPath TEXT PRIMARY KEY",
-        "Name TEXT",
-        "Size INTEGER"
-    ]
-    if hash_choice in ['sha1', 'both']:
-        columns.append('SHA1Hash TEXT')
-    if hash_choice in ['md5', 'both']:
-        columns.append('MD5Hash TEXT')
-    columns.extend(['CreationTime TEXT', 'ModificationTime TEXT', 'AccessTime TEXT'])
-
-    create_table_sql = f"CREATE TABLE IF NOT EXISTS directory_contents ({', '.join(columns)})"
+    fields = SQLITE_FIELDS[hash_choice]
+    create_table_sql = f"CREATE TABLE IF NOT EXISTS directory_contents ({', '.join(SQLITE_COLUMNS[i] for i in fields)})"
     cursor.execute(create_table_sql)
+    # Rows are stored in scan order; this view gives a stable, path-sorted listing
+    cursor.execute("CREATE VIEW IF NOT EXISTS directory_contents_sorted AS SELECT * FROM directory_contents ORDER BY FullPath")
 
-    column_names_for_insert = ['Type', 'FullPath', 'Name', 'Size']
-    if hash_choice in ['sha1', 'both']:
-        column_names_for_insert.append('SHA1Hash')
-    if hash_choice in ['md5', 'both']:
-        column_names_for_insert.append('MD5Hash')
-    column_names_for_insert.extend(['CreationTime', 'ModificationTime', 'AccessTime'])
-    
+    column_names_for_insert = [SQLITE_COLUMNS[i].split()[0] for i in fields]
     placeholders = ', '.join(['?'] * len(column_names_for_insert))
-    insert_sql = f"INSERT OR REPLACE INTO directory_contents ({', '.join(column_names_for_insert)}) VALUES ({placeholders})"
+    insert_sql = f"INSERT INTO directory_contents ({', '.join(column_names_for_insert)}) VALUES ({placeholders})"
 
-    entry_data_list = []
-    total_items = len(data)
-    progress_interval = max(1, total_items // 1000)
-    
-    update_counter(0, total_items, "Preparing data for SQLite...")
-
-    for i, item in enumerate(data):
-        # Throttled Update
-        if (i + 1) % progress_interval == 0:
-            update_counter(i + 1, total_items, "Preparing data for SQLite...")
-
-        entry_data = [
-            item['Type'],
-            item['FullPath'],
-            item['Name'],
-            item['Size']
-        ]
-        if hash_choice in ['sha1', 'both']:
-            entry_data.append(item['SHA1 Hash'])
-        if hash_choice in ['md5', 'both']:
-            entry_data.append(item['MD5 Hash'])
-        entry_data.extend([
-            item['Creation Time'],
-            item['Modification Time'],
-            item['Access Time']
-        ])
-        
-        entry_data_list.append(tuple(entry_data))
+    rows = map(operator.itemgetter(*fields), data)
+    total_items = 0
     
     try:
-        # Update before bulk operation
-        update_counter(total_items, total_items, "Executing bulk insert into SQLite...")
-        cursor.executemany(insert_sql, entry_data_list)
-        conn.commit() 
-    except Exception as e:
-        conn.rollback()
-        raise e
+        with conn: # Commits once at the end, rolls back everything on error
+            cursor.execute("BEGIN IMMEDIATE") # Take the write lock once, before the first batch
+            while True:
+                batch = list(itertools.islice(rows, SQLITE_BATCH_SIZE))
+                if not batch:
+                    break
+                cursor.executemany(insert_sql, batch)
+                total_items += len(batch)
+            # Build the path index once over the loaded rows instead of updating it per insert
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_fullpath ON directory_contents(FullPath)")
+        # Leave a self-contained file behind (no -wal/-shm sidecars needed to read it)
+        cursor.execute("PRAGMA journal_mode=DELETE")
     finally:
         conn.close()
         
-    update_counter(total_items, total_items, "SQLite Export complete.")
+    update_counter(total_items, None, "SQLite Export complete.")
+    return total_items
+
+def export_to_parquet(data, output_parquet_file, hash_choice, update_counter):
+    """
+    Exports the collected data to a Parquet file using polars (optional dependency) and returns the row count.
+    Optimized: Item tuples are pivoted into columns and written by polars' native writer.
+    """
+    if pl is None:
+        raise RuntimeError("Parquet export requires the 'polars' package (pip install polars).")
+
+    fields = CSV_FIELDS[hash_choice]
+    column_values = list(zip(*data)) or [()] * len(Item._fields)
+    columns = {CSV_COLUMNS[i]: list(column_values[i]) for i in fields}
+
+    schema = {name: (pl.Int64 if name == 'Size (bytes)' else pl.Utf8) for name in columns}
+    df = pl.DataFrame(columns, schema=schema)
+    df.write_parquet(output_parquet_file)
+
+    update_counter(df.height, None, "Parquet Export complete.")
+    return df.height
 
 def open_export_folder(folder_path):
     """Opens the specified folder path using the default file explorer based on the OS."""
@@ -289,9 +687,16 @@ class DirListHashApp(ctk.CTk):
         # Variables
         self.input_dir_path = ctk.StringVar(value="") 
         self.output_dir_path = ctk.StringVar(value="") 
+        self.previous_db_path = ctk.StringVar(value="") 
         self.hash_choice = ctk.StringVar(value="none") 
+        self.duplicates_only = ctk.BooleanVar(value=False)
+        self.estimate_total = ctk.BooleanVar(value=False)
+        self.use_processes = ctk.BooleanVar(value=False)
         self.output_choice = ctk.StringVar(value="csv")
         self.final_output_dir = None 
+        # Latest progress update from the worker thread (None once shown), see update_counter
+        self._progress_cell = None
+        self._progress_lock = threading.Lock()
         
         # --- Widgets ---
         self._create_log_frame()
@@ -304,6 +709,8 @@ class DirListHashApp(ctk.CTk):
         ctk.set_appearance_mode("System")
         ctk.set_default_color_theme("blue")
 
+        self.after(PROGRESS_POLL_MS, self._drain_progress)
+
     def _create_image_header(self):
         image_frame = ctk.CTkFrame(self, fg_color="transparent")
         image_frame.grid(row=0, column=0, padx=20, pady=(10, 0), sticky="ew")
@@ -334,6 +741,11 @@ class DirListHashApp(ctk.CTk):
         ctk.CTkEntry(input_frame, textvariable=self.output_dir_path).grid(row=1, column=1, padx=(0, 10), pady=5, sticky="ew")
         ctk.CTkButton(input_frame, text="Browse", command=self.select_output_dir).grid(row=1, column=2, padx=0, pady=5)
 
+        # Previous Report (optional): hashes of unchanged files are reused from it
+        ctk.CTkLabel(input_frame, text="Previous Report (.db):").grid(row=2, column=0, padx=(0, 10), pady=5, sticky="w")
+        ctk.CTkEntry(input_frame, textvariable=self.previous_db_path).grid(row=2, column=1, padx=(0, 10), pady=5, sticky="ew")
+        ctk.CTkButton(input_frame, text="Browse", command=self.select_previous_db).grid(row=2, column=2, padx=0, pady=5)
+
     def _create_options_frame(self):
         options_frame = ctk.CTkFrame(self, fg_color="transparent")
         options_frame.grid(row=2, column=0, padx=20, pady=5, sticky="ew")
@@ -345,18 +757,28 @@ class DirListHashApp(ctk.CTk):
         hash_frame.grid(row=0, column=0, padx=(0, 10), pady=10, sticky="nsew")
         ctk.CTkLabel(hash_frame, text="Hash Type", font=ctk.CTkFont(weight="bold")).pack(padx=10, pady=(10, 5))
         
-        hash_options = ["none", "sha1", "md5", "both"]
+        hash_options = ["none", "sha1", "md5", "both", "blake3"]
         for i, option in enumerate(hash_options):
-            ctk.CTkRadioButton(hash_frame, text=option.upper(), variable=self.hash_choice, value=option).pack(padx=20, pady=2, anchor="w")
+            # BLAKE3 needs the optional blake3 package
+            state = "disabled" if option == "blake3" and blake3 is None else "normal"
+            ctk.CTkRadioButton(hash_frame, text=option.upper(), variable=self.hash_choice, value=option, state=state).pack(padx=20, pady=2, anchor="w")
+        # Files with a unique size cannot have a duplicate, so they can be left unhashed
+        ctk.CTkCheckBox(hash_frame, text="Only hash same-size files", variable=self.duplicates_only).pack(padx=20, pady=(6, 2), anchor="w")
+        # Opt-in: an extra (names only) pass over the tree so progress shows a total
+        ctk.CTkCheckBox(hash_frame, text="Count items first (show total)", variable=self.estimate_total).pack(padx=20, pady=2, anchor="w")
+        # Opt-in: worker processes help when hashing, not disk reads, is the bottleneck
+        ctk.CTkCheckBox(hash_frame, text="Hash in separate processes", variable=self.use_processes).pack(padx=20, pady=(2, 10), anchor="w")
 
         # Output Options Frame
         output_frame = ctk.CTkFrame(options_frame)
         output_frame.grid(row=0, column=1, padx=(10, 0), pady=10, sticky="nsew")
         ctk.CTkLabel(output_frame, text="Output Format", font=ctk.CTkFont(weight="bold")).pack(padx=10, pady=(10, 5))
         
-        output_options = ["csv", "sqlite", "both"]
+        output_options = ["csv", "sqlite", "both", "parquet"]
         for i, option in enumerate(output_options):
-            ctk.CTkRadioButton(output_frame, text=option.upper(), variable=self.output_choice, value=option).pack(padx=20, pady=2, anchor="w")
+            # Parquet needs the optional polars package
+            state = "disabled" if option == "parquet" and pl is None else "normal"
+            ctk.CTkRadioButton(output_frame, text=option.upper(), variable=self.output_choice, value=option, state=state).pack(padx=20, pady=2, anchor="w")
 
         # Start Button
         start_button = ctk.CTkButton(self, 
@@ -404,12 +826,32 @@ class DirListHashApp(ctk.CTk):
             print(full_message) # Fallback to console if GUI isn't ready
     
     def update_counter(self, current, total, text):
-        """Updates the GUI status label with the counter (current/total) and text."""
-        self.after(0, self._set_gui_counter, current, total, text)
+        """
+        Updates the GUI status label with the counter (current/total, or current alone when total is None) and text.
+        Optimized: Only stores the latest value (safe from worker threads); _drain_progress shows it, so
+        GUI work stays at one label update per PROGRESS_POLL_MS however fast updates arrive.
+        """
+        with self._progress_lock:
+            self._progress_cell = (current, total, text)
+
+    def _flush_progress(self):
+        """Shows the pending progress update, if any. Main thread only."""
+        with self._progress_lock:
+            cell, self._progress_cell = self._progress_cell, None
+        if cell is not None:
+            self._set_gui_counter(*cell)
+
+    def _drain_progress(self):
+        """Recurring main-thread poller for update_counter."""
+        self._flush_progress()
+        self.after(PROGRESS_POLL_MS, self._drain_progress)
         
     def _set_gui_counter(self, current, total, text):
         """Internal method for thread-safe GUI updates."""
-        self.status_label.configure(text=f"{text} ({current}/{total})")
+        if total is None:
+            self.status_label.configure(text=f"{text} ({current})")
+        else:
+            self.status_label.configure(text=f"{text} ({current}/{total})")
 
     def _write_log_to_file(self):
         """Writes the entire content of the activity log to a text file."""
@@ -445,6 +887,13 @@ class DirListHashApp(ctk.CTk):
             normalized_path = folder_selected.replace('/', '\\') if platform.system() == "Windows" else folder_selected
             self.output_dir_path.set(normalized_path)
 
+    def select_previous_db(self):
+        """Opens a dialog to select a previous SQLite report whose hashes can be reused."""
+        file_selected = filedialog.askopenfilename(title="Select Previous DirListHash Report", filetypes=[("SQLite database", "*.db"), ("All files", "*.*")])
+        if file_selected:
+            normalized_path = file_selected.replace('/', '\\') if platform.system() == "Windows" else file_selected
+            self.previous_db_path.set(normalized_path)
+
     # --- Processing Logic ---
 
     def start_processing_thread(self):
@@ -452,6 +901,9 @@ class DirListHashApp(ctk.CTk):
         if not self.input_dir_path.get() or not os.path.isdir(self.input_dir_path.get()):
             messagebox.showerror("Input Error", "Please select a valid input directory.")
             return
+        if self.previous_db_path.get() and not os.path.isfile(self.previous_db_path.get()):
+            messagebox.showerror("Input Error", "The previous report file does not exist.")
+            return
 
         self.final_output_dir = None
         self.start_button.configure(state="disabled", text="Processing...")
@@ -462,7 +914,11 @@ class DirListHashApp(ctk.CTk):
         self.log(f"Process started at: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         self.log(f"Input Directory: {self.input_dir_path.get()}")
         self.log(f"Output Directory: {self.output_dir_path.get()}")
+        if self.previous_db_path.get():
+            self.log(f"Previous Report: {self.previous_db_path.get()}")
         self.log(f"Hash Type: {self.hash_choice.get()}")
+        if self.duplicates_only.get() and self.hash_choice.get() != 'none':
+            self.log("Hashing only files that share their size with another file.")
         self.log(f"Output Format: {self.output_choice.get()}")
         
         self.worker_thread = threading.Thread(target=self._process_directory)
@@ -475,6 +931,10 @@ class DirListHashApp(ctk.CTk):
             output_dir_base = self.output_dir_path.get()
             hash_choice = self.hash_choice.get()
             output_choice = self.output_choice.get()
+            previous_db_file = self.previous_db_path.get()
+            duplicates_only = self.duplicates_only.get()
+            estimate_total = self.estimate_total.get()
+            use_processes = self.use_processes.get()
             
             current_datetime = datetime.datetime.now()
             timestamp_str = current_datetime.strftime("%Y%m%d_%H%M%S") 
@@ -491,9 +951,19 @@ class DirListHashApp(ctk.CTk):
             self.final_output_dir = output_dir_final 
             self.log(f"Created output directory: {self.final_output_dir}")
 
+            hash_cache = None
+            if previous_db_file and hash_choice != 'none':
+                hash_cache = load_hash_cache(previous_db_file)
+                self.log(f"Loaded {len(hash_cache)} cached file hashes from previous report.")
+
             self.log("Starting data collection...")
-            collected_data = collect_directory_data(input_dir, hash_choice, self.update_counter) 
-            self.log(f"Collected data for {len(collected_data)} items.")
+            # Rows stream straight from the directory scan into the exporters
+            collected_data = iter_directory_data(input_dir, hash_choice, self.update_counter, hash_cache, duplicates_only,
+                                                 estimate_total=estimate_total, use_processes=use_processes)
+            if output_choice == 'both':
+                # Both exports read the same rows, so collect them once
+                collected_data = list(collected_data)
+                self.log(f"Collected data for {len(collected_data)} items.")
             
             clean_path = input_dir.replace('\\', '_').replace('/', '_').replace(':', '_').replace(' ', '_').strip('_')
             if not clean_path: clean_path = "root"
@@ -504,15 +974,22 @@ class DirListHashApp(ctk.CTk):
                 csv_filename = base_filename + ".csv"
                 output_csv_file = os.path.normpath(os.path.join(self.final_output_dir, csv_filename)) 
                 self.log(f"Exporting to CSV: {output_csv_file}")
-                export_to_csv(collected_data, output_csv_file, hash_choice, self.update_counter)
-                self.log("CSV Export finished.")
+                item_count = export_to_csv(collected_data, output_csv_file, hash_choice, self.update_counter)
+                self.log(f"CSV Export finished ({item_count} items).")
 
             if output_choice in ['sqlite', 'both']:
                 db_filename = base_filename + ".db"
                 output_db_file = os.path.normpath(os.path.join(self.final_output_dir, db_filename)) 
                 self.log(f"Exporting to SQLite: {output_db_file}")
-                export_to_sqlite(collected_data, output_db_file, hash_choice, self.update_counter)
-                self.log("SQLite Export finished.")
+                item_count = export_to_sqlite(collected_data, output_db_file, hash_choice, self.update_counter)
+                self.log(f"SQLite Export finished ({item_count} items).")
+
+            if output_choice == 'parquet':
+                parquet_filename = base_filename + ".parquet"
+                output_parquet_file = os.path.normpath(os.path.join(self.final_output_dir, parquet_filename)) 
+                self.log(f"Exporting to Parquet: {output_parquet_file}")
+                item_count = export_to_parquet(collected_data, output_parquet_file, hash_choice, self.update_counter)
+                self.log(f"Parquet Export finished ({item_count} items).")
 
             self.after(0, self._finalize_success)
 
@@ -524,6 +1001,7 @@ class DirListHashApp(ctk.CTk):
         end_time = datetime.datetime.now()
         self.log(f"Process finished successfully at: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
         self._write_log_to_file()
+        self._flush_progress() # So a late progress update cannot overwrite the final status
         self.status_label.configure(text="Process Complete!")
         self.start_button.configure(state="normal", text="▶️ Start Scan and Export")
         
@@ -537,6 +1015,7 @@ class DirListHashApp(ctk.CTk):
         """Runs in the main thread after an error."""
         self.log(f"ERROR: {e}")
         self._write_log_to_file()
+        self._flush_progress()
         self.status_label.configure(text="ERROR! Check log.")
         self.start_button.configure(state="normal", text="▶️ Start Scan and Export")
         messagebox.showerror("Error", f"An error occurred: {e}")
@@ -544,6 +1023,7 @@ class DirListHashApp(ctk.CTk):
 # --- Execution ---
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support() # Lets the frozen .exe start hashing worker processes
     ctk.set_appearance_mode("System")
     ctk.set_default_color_theme("blue")
     app = DirListHashApp()